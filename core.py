@@ -1,14 +1,111 @@
 import pygame
 from typing import Any, Iterable, List, Literal, Union, Sequence, overload, TypedDict, Self, Callable, TypeVar
-from os import listdir
+from os import scandir
+from collections import OrderedDict
 
 from .exceptions import *
-from .easing import EASING_FUNCTIONS
+from .easing import EASING_FUNCTIONS, linear
 pygame.init()
 
 
+def freeze(val):
+    """
+    Converts a value to a hashable one, so it can be used as a cache key.
+
+    Lists, tuples, dicts, rects, colors and vectors are converted recursively, everything else is returned unchanged.
+    Keys made from other unhashable values raise `TypeError` when they are used.
+    """
+    if type(val) in (list, tuple):
+        return tuple(freeze(v) for v in val)
+    if type(val) is dict:
+        return tuple((k, freeze(v)) for k, v in val.items())
+    if isinstance(val, (pygame.Rect, pygame.FRect, pygame.Color, pygame.Vector2, pygame.Vector3)):
+        return tuple(val)
+
+    return val
+
+
+
+
+class LRUCache(OrderedDict):
+    """
+    A dictionary that only keeps the `maxsize` most recently used items.
+    """
+    def __init__(self, maxsize: int = 128):
+        super().__init__()
+        self.maxsize = maxsize
+
+
+    def get(self, key, default=None):
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        return default
+
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+
+class SurfaceCache(LRUCache):
+    """
+    An `LRUCache` of surfaces, which also drops the least recently used ones while their pixels take more than `maxbytes`.
+    """
+    def __init__(self, maxbytes: int, maxsize: int = 1024):
+        super().__init__(maxsize)
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+
+
+    def __setitem__(self, key, surf: pygame.Surface) -> None:
+        if key in self:
+            old = OrderedDict.__getitem__(self, key)
+            self.nbytes -= old.get_pitch() * old.get_height()
+        OrderedDict.__setitem__(self, key, surf)
+        self.move_to_end(key)
+        self.nbytes += surf.get_pitch() * surf.get_height()
+
+        # the newest surface is kept even if it is larger than the limit on its own
+        while len(self) > 1 and (self.nbytes > self.maxbytes or len(self) > self.maxsize):
+            self.popitem(last=False)
+
+
+    def popitem(self, last=True):
+        key, surf = super().popitem(last)
+        self.nbytes -= surf.get_pitch() * surf.get_height()
+        return key, surf
+
+
+    def clear(self) -> None:
+        super().clear()
+        self.nbytes = 0
+
+
+
+
+
+_font_cache: dict[tuple[str | None, int], pygame.Font] = {}
+
+def get_font(name: str | None = None, size: int = 20) -> pygame.Font:
+    """Returns the font with the given file name and size. Every font is only opened once."""
+    key = (name, size)
+    font = _font_cache.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.Font(name, size)
+        _font_cache[key] = font
+
+    return font
+
+
+
 FONTS = {
-    'basic': pygame.Font(None, 500)
+    'basic': get_font(None, 500)
 }
 
 
@@ -37,7 +134,10 @@ class Animation:
     - `end_func`: function -> a function to call when the animation is completed.
     - `end_funcs`: list[function] -> a list of functions to be called on completion.
     - `functions`: dict[int, function] -> functions to be called when the animation reaches a specific frame.
-    - `listdir_key`: function -> sorting key function for directory listing. (same as in `min` or `max`)
+    - `listdir_key`: function -> sorting key function for the file names in `_dir`. (same as in `min` or `max`)
+    - `lazy`: bool -> Only load a frame when it is first shown (only with `files` and `_dir`). Makes creating the animation faster, but the first playback can stutter.
+
+    Frames that are not flipped share their pixels with the loaded image files, do not draw on them.
     """
     @overload
     def __init__(self, files: list[str], speed: int = 1, flip=(False,False), **kwds): ...
@@ -59,105 +159,165 @@ class Animation:
                  **kwds):
         
         self.frames = []
+        self._frame_paths: list[str] = []
+        self._convert_alpha = kwds.get('convert_alpha',False)
+        self._flip = tuple(flip) if any(flip) else None # None if nothing has to be flipped
         self.frame_index = 0
         self.speed = speed
         self.frame_since_last = 0
-        self.loop_frames: Coordinate = (0,-1)
+        self._loop_frames: Coordinate = (0,-1)
+        self.finished = False # set when the end functions were called
 
         self.functions: dict[int,function] = kwds.get('functions',{})
         self.end_funcs: list[function] = kwds.get('end_funcs',[])
         if kwds.get('end_func'): self.end_funcs.append(kwds.get('end_func'))
 
 
-        self.offset = kwds.get('offset',(0,0))
-        _offsets = kwds.get('offsets',[])
-        self.offsets: list[Coordinate] = _offsets
+        self.offset: Coordinate = kwds.get('offset',(0,0))
 
         if file:
-            full_img = pygame.image.load(file).convert_alpha()
+            full_img = load_image(file, True)
 
             if end is None:
                 end = full_img.get_width() if step == 'horizontal' else full_img.get_height()
 
             _range_step = size[0]  if step == 'horizontal' else size[1]
 
+            # the whole sheet is flipped once, the frames are cut from the mirrored positions
+            if self._flip:
+                full_img = pygame.transform.flip(full_img, *flip)
+            _w, _h = full_img.get_size()
+
             for f in range(0,end,_range_step):
                 if step == 'horizontal':
-                    _s = full_img.subsurface((f,start[1],*size))
+                    x, y = f, start[1]
                 else:
-                    _s = full_img.subsurface((start[0],f,*size))
+                    x, y = start[0], f
+
+                if flip[0]:
+                    x = _w - x - size[0]
+                if flip[1]:
+                    y = _h - y - size[1]
                     
-                self.frames.append(pygame.transform.flip(_s,*flip))
+                self.frames.append(full_img.subsurface((x,y,*size)))
 
 
         elif files:
-            for file in files:
-                if kwds.get('convert_alpha',False):
-                    _s = pygame.image.load(file).convert_alpha()
-                else:
-                    _s = pygame.image.load(file).convert()
-
-                self.frames.append(pygame.transform.flip(_s,*flip))
+            self._frame_paths = list(files)
 
 
         elif _dir:
-            _ld = listdir(_dir)
-            _ld.sort(key= kwds.get('listdir_key'))
-            for file in _ld:
-                if kwds.get('convert_alpha',False):
-                    _s = pygame.image.load(_dir+'/'+file).convert_alpha()
-                else:
-                    _s = pygame.image.load(_dir+'/'+file).convert()
+            # scandir gives the full paths and the file type without extra system calls
+            with scandir(_dir) as _it:
+                _paths = {entry.name: entry.path for entry in _it if entry.is_file()}
+            self._frame_paths = [_paths[name] for name in sorted(_paths, key= kwds.get('listdir_key'))]
+
+
+        # Frames from separate files. Not loaded frames are None in self.frames
+        if self._frame_paths:
+            self.frames = [None] * len(self._frame_paths)
+            if not kwds.get('lazy'):
+                self.load()
 
-                self.frames.append(pygame.transform.flip(_s,*flip))
 
+        # the offsets are set here, when the number of frames is known
+        self.offsets: list[Coordinate] = kwds.get('offsets') or [(0,0)] * len(self.frames)
 
-        if not _offsets:
-            self.offsets = [(0,0) for _ in range(len(self.frames))]
+        self._update_loop()
 
 
 
     @property
     def frame(self):
-        return self.frames[self.frame_index]
+        frame = self.frames[self.frame_index]
+        if frame is None:
+            frame = self._load_frame(self.frame_index)
+        return frame
+
+
+
+    def _load_frame(self, i: int) -> pygame.Surface:
+        frame = load_image(self._frame_paths[i], self._convert_alpha)
+        if self._flip:
+            frame = pygame.transform.flip(frame, *self._flip)
+        self.frames[i] = frame
+        return frame
+
+
+    def load(self):
+        """Loads every frame that is not loaded yet. Only needed if the animation was created with `lazy`."""
+        for i, frame in enumerate(self.frames):
+            if frame is None:
+                self._load_frame(i)
+
+
+    @property
+    def loop_frames(self) -> Coordinate:
+        """(start, end) frame indices to loop between. `end` = -1 means no loop."""
+        return self._loop_frames
+
+    @loop_frames.setter
+    def loop_frames(self, val: Coordinate):
+        self._loop_frames = val
+        self._update_loop()
+
+
+    def _update_loop(self):
+        """Precomputes the last frame index that `tick` can show before looping or ending."""
+        start, end = self._loop_frames
+        self._loop_active = end != -1
+        self._loop_start = start
+        self._loop_end = end if self._loop_active else len(self.frames) - 1
 
 
 
     def tick(self, step=1):
-        if self.frame_since_last < self.speed:
-            self.frame_since_last += 1      
+        fsl = self.frame_since_last + 1
+        if fsl <= self.speed:
+            self.frame_since_last = fsl
             return
         
         self.frame_since_last = 0
-        self.frame_index += step
-
-        if self.loop_frames[1] != -1 and self.frame_index > self.loop_frames[1]:
-            self.frame_index = self.loop_frames[0]
-            
-        elif self.frame_index >= len(self.frames)-1:
-            if self.end_funcs:
-                for func in self.end_funcs:
-                    func()
+        idx = self.frame_index + step
+        loop_end = self._loop_end
+
+        if idx > loop_end:
+            if self._loop_active:
+                idx = self._loop_start
+
+            elif self.end_funcs:
+                # the animation stays on its last frame, the end functions are only called once
+                idx = loop_end
+                if not self.finished:
+                    self.finished = True
+                    for func in self.end_funcs:
+                        func()
             else:
-                self.frame_index = 0
+                idx = 0
 
-        func = self.functions.get(self.frame)
-        if func:
-            func()
+        self.frame_index = idx
+
+        functions = self.functions
+        if functions:
+            func = functions.get(idx)
+            if func:
+                func()
 
 
     
     def scale_by(self, factor: Coordinate):
-        self.offset = (self.offset[0]*factor[0], self.offset[1]*factor[1])
-        for i in range(len(self.frames)):
-            self.frames[i] = pygame.transform.scale_by(self.frames[i],factor)
-            self.offsets[i] = (self.offsets[i][0]*factor[0], self.offsets[i][1]*factor[1])
+        self.load()
+        fx, fy = factor
+        self.offset = (self.offset[0]*fx, self.offset[1]*fy)
+        self.frames = [pygame.transform.scale_by(frame, factor) for frame in self.frames]
+        self.offsets = [(x*fx, y*fy) for x, y in self.offsets]
 
     
 
     def reset(self):
         self.frame_index = 0
         self.frame_since_last = 0
+        self.finished = False
 
 
     
@@ -172,12 +332,19 @@ class Animation:
 
         As the name suggests, you can directly put this into `Surface.blit`
         """
-        if rect:
-            return self.frame, (rect.left + self.offsets[self.frame_index][0] + self.offset[0],
-                                             rect.top + self.offsets[self.frame_index][1] + self.offset[1])
+        i = self.frame_index
+        frame = self.frames[i]
+        if frame is None:
+            frame = self._load_frame(i)
+
+        fx, fy = self.offsets[i]
+        ox, oy = self.offset
+        ox += fx
+        oy += fy
+        if rect is not None:
+            return frame, (rect.left + ox, rect.top + oy)
         else:
-            return self.frame, (pos[0] + self.offsets[self.frame_index][0] + self.offset[0],
-                                             pos[1] + self.offsets[self.frame_index][1] + self.offset[1])
+            return frame, (pos[0] + ox, pos[1] + oy)
 
 
 
@@ -248,7 +415,12 @@ class Style(TypedDict):
 
 
 State = Style # if someone likes this word more
-CombinedStyle = dict[str, dict[str, str | Style]] # used for CombinedStatedSprites
+class CombinedStyle(dict[str, str | Style]):
+    """
+    Style of a CombinedStatedSprite: the state name or Style of each of its sprites, by key.
+    Plain dicts are accepted everywhere too.
+    """
+    __slots__ = ()
 
     
 
@@ -263,9 +435,6 @@ EasingName = Literal[
     "quadric_in",
     "quadric_out",
     "quadric_in_out",
-    "cubic_in",
-    "cubic_out",
-    "cubic_in_out",
     "sine_in",
     "sine_out",
     "sine_in_out",
@@ -287,17 +456,44 @@ EasingName = Literal[
 
 
 
+class MouseState:
+    """
+    The state of the mouse, shared by the default event checks of every sprite.
+
+    `Sprite.handle_event` refreshes it. `SpriteGroup.handle_event` refreshes it once and sets `held` while its sprites handle the event, so the mouse is only read once for the whole group.
+    Call `MouseState.refresh()` yourself if you use the checks outside of `handle_event`, e.g. once per frame.
+    """
+    pos: tuple[int, int] = (0, 0)
+    pressed: tuple[bool, bool, bool] = (False, False, False)
+    held: bool = False
+
+    @classmethod
+    def refresh(cls):
+        """Reads the state of the mouse. Does nothing while `held` is set."""
+        if cls.held:
+            return
+
+        cls.pos = pygame.mouse.get_pos()
+        cls.pressed = pygame.mouse.get_pressed(num_buttons=3)
+
+
+
+# the event types and `MouseState` are bound as default arguments, so the checks read them as locals
+_DOWN, _UP, _M = pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, MouseState
+
 DEFAULT_EVENT_CHECKS = {
-    'onhover': lambda sprite,_: sprite.rect.collidepoint(pygame.mouse.get_pos()),
-    'onclick': lambda sprite,event: event.type == pygame.MOUSEBUTTONDOWN and sprite.rect.collidepoint(pygame.mouse.get_pos()),
-    'onleftclick': lambda sprite,event: event.type == pygame.MOUSEBUTTONDOWN and pygame.mouse.get_pressed()[0] and sprite.rect.collidepoint(pygame.mouse.get_pos()),
-    'onmiddleclick': lambda sprite,event: event.type == pygame.MOUSEBUTTONDOWN and pygame.mouse.get_pressed()[1] and sprite.rect.collidepoint(pygame.mouse.get_pos()),
-    'onrightclick': lambda sprite,event: event.type == pygame.MOUSEBUTTONDOWN and pygame.mouse.get_pressed()[2] and sprite.rect.collidepoint(pygame.mouse.get_pos()),
-    'onrelease': lambda _,event: event.type == pygame.MOUSEBUTTONUP,
-    'onleftrelease': lambda _,event: event.type == pygame.MOUSEBUTTONUP and not pygame.mouse.get_pressed()[0],
-    'onmiddlerelease': lambda _,event: event.type == pygame.MOUSEBUTTONUP and not pygame.mouse.get_pressed()[1],
-    'onrightrelease': lambda _,event: event.type == pygame.MOUSEBUTTONUP and not pygame.mouse.get_pressed()[2],
+    'onhover': lambda sprite,_,_M=_M: sprite.rect.collidepoint(_M.pos),
+    'onclick': lambda sprite,event,_DOWN=_DOWN,_M=_M: event.type == _DOWN and sprite.rect.collidepoint(_M.pos),
+    'onleftclick': lambda sprite,event,_DOWN=_DOWN,_M=_M: event.type == _DOWN and _M.pressed[0] and sprite.rect.collidepoint(_M.pos),
+    'onmiddleclick': lambda sprite,event,_DOWN=_DOWN,_M=_M: event.type == _DOWN and _M.pressed[1] and sprite.rect.collidepoint(_M.pos),
+    'onrightclick': lambda sprite,event,_DOWN=_DOWN,_M=_M: event.type == _DOWN and _M.pressed[2] and sprite.rect.collidepoint(_M.pos),
+    'onrelease': lambda _,event,_UP=_UP: event.type == _UP,
+    'onleftrelease': lambda _,event,_UP=_UP,_M=_M: event.type == _UP and not _M.pressed[0],
+    'onmiddlerelease': lambda _,event,_UP=_UP,_M=_M: event.type == _UP and not _M.pressed[1],
+    'onrightrelease': lambda _,event,_UP=_UP,_M=_M: event.type == _UP and not _M.pressed[2],
 }
+del _DOWN, _UP, _M
+
 
 
 
@@ -305,6 +501,12 @@ DEFAULT_EVENT_CHECKS = {
 
 
 
+# Style keys that can be transitioned
+COLOR_KEYS = frozenset(('bg','fg','border','text_color'))
+RADIUS_KEYS = frozenset(('border_radius','fg_radius'))
+TRANSITION_KEYS = COLOR_KEYS | RADIUS_KEYS | frozenset(('rect',))
+
+
 
 class Transition:
     """
@@ -323,91 +525,124 @@ class Transition:
         self.time = time
         self.current_time = 0
 
-        if type(easing) is str:
+        if isinstance(easing, str):
             self.easing_func = EASING_FUNCTIONS.get(easing)
             if self.easing_func is None:
                 raise KeyError(f"Invalid easing function name: '{easing}'")
             
-        elif type(easing) is Callable:
+        elif callable(easing):
             self.easing_func = easing
         else:
             raise TypeError("The easing must be either 'str' or 'Callable'")
 
 
 
-        self.style_keys = set(*style_keys)
+        # a single list of keys is accepted too
+        if len(style_keys) == 1 and not isinstance(style_keys[0], str):
+            style_keys = tuple(style_keys[0])
+
         if _all:
-            self.style_keys = set(style1.keys()).union(set(style2.keys()))
-        elif not style_keys:
-            self.style_keys = set(style2.keys())
+            _keys = style1.keys() | style2.keys()
+        elif style_keys:
+            _keys = set(style_keys)
+        else:
+            _keys = style2.keys()
 
 
 
-        self.style1 = style1.copy()
-        self.style2 = style2.copy()
+        # the given styles are only read, `self.style` is the only copy
+        self.style1 = style1
+        self.style2 = style2
+        self.style: Style = style1.copy()
 
 
+        # (key, is color, start values, differences) of every transitioned value, so `tick` only has to scale the differences
+        self._channels: list[tuple[str, bool, tuple, tuple]] = []
 
-        _to_remove = set()
+        _used_keys = []
         # Make all values the same type
-        for key in self.style_keys:
-            s1_val = self.style1.get(key)
-            s2_val = self.style2.get(key)
+        for key in _keys:
+            s1_val = style1.get(key)
+            s2_val = style2.get(key)
 
-            # Remove not used keys from self.style_keys
+            # Keys that are not in the target style are not used
             if s2_val is None:
-                _to_remove.add(key)
                 continue
+            _used_keys.append(key)
             
             # All colors must be in RGBA format
-            if key in ('bg','fg','border','text_color'):
-                if type(s1_val) in (str,int):
+            if key in COLOR_KEYS:
+                if isinstance(s1_val, (str,int)):
                     raise IncorrectColorError(f"'{s1_val}' can not be accepted in a Transition. The color value must be a sequence of integers (RGB or RGBA).")
-                if type(s2_val) in (str,int):
+                if isinstance(s2_val, (str,int)):
                     raise IncorrectColorError(f"'{s2_val}' can not be accepted in a Transition. The color value must be a sequence of integers (RGB or RGBA).")
             
-                self.style1[key] = list(to_rgba(s1_val))
-                self.style2[key] = list(to_rgba(s2_val))
+                s1_val = to_rgba(s1_val)
+                s2_val = to_rgba(s2_val)
+
 
+            elif key in RADIUS_KEYS:
+                # a missing radius is a square corner
+                s1_val = radius_kwds(s1_val or 0, True)
+                s2_val = radius_kwds(s2_val, True)
+                for val in (s1_val, s2_val):
+                    if type(val) is dict or len(val) != 4:
+                        raise ValueError(f"'{val}' can not be accepted in a Transition. The radius must be an int or a sequence of 4 ints.")
 
-            elif key in ('border_radius','fg_radius'):
-                self.style1[key] = list(radius_kwds(s1_val, True))
-                self.style2[key] = list(radius_kwds(s2_val, True))
 
+            if key in TRANSITION_KEYS:
+                start = tuple(s1_val)
+                diff = tuple(b - a for a, b in zip(start, s2_val))
+                self._channels.append((key, key in COLOR_KEYS, start, diff))
+                self.style[key] = list(start)
 
 
-        self.style_keys = self.style_keys.difference(_to_remove)
 
+        self.style_keys = frozenset(_used_keys)
 
-        self.style: Style = self.style1.copy()
+        # steps that move no value by half a unit are skipped, see `tick`
+        self._max_diff = max((abs(d) for channel in self._channels for d in channel[3]), default=0)
+        self._last_progress = 0.0
+        self.changed = False
 
 
 
 
     
     def tick(self, delta_time: float = 1) -> Style:
-        """Calculate next frame of the transition."""
+        """
+        Calculate next frame of the transition.
+        `changed` is False if the step moved every value by less than half a unit. The values are not updated then, so they may lag by at most one unit until the next applied step.
+        """
         self.current_time += delta_time
-        progress = self.easing_func(self.current_time / self.time)
-
-
-        for key in self.style_keys:
-            s1_val = self.style1[key]
-            s2_val = self.style2[key]
-            
-            
-            if key in ('bg','fg','border','text_color','border_radius','fg_radius','rect'):
-                for i in range(4):
-                    diff = s2_val[i] - s1_val[i]
-                    if key in ('bg','fg','border','text_color'):
-                        # must be a valid color value
-                        self.style[key][i] = min(max(round(s1_val[i] + diff * progress), 0), 255)
-                    else:
-                        self.style[key][i] = round(s1_val[i] + diff * progress)
-                    
 
         if self.current_time >= self.time:
+            # the last frame is exactly the target style
             self.finished = True
+            progress = 1.0
+        else:
+            ease = self.easing_func
+            progress = self.current_time / self.time
+            if ease is not linear:
+                progress = ease(progress)
+
+            if abs(progress - self._last_progress) * self._max_diff < 0.5:
+                self.changed = False
+                return self.style
+
+        self.changed = True
+        self._last_progress = progress
+
+
+        # between the two styles colors are always valid, only overshooting easings have to be clamped
+        clamp = not 0 <= progress <= 1
+
+        for key, is_color, start, diff in self._channels:
+            if is_color and clamp:
+                # must be a valid color value
+                self.style[key] = [0 if v < 0 else 255 if v > 255 else v for a, d in zip(start, diff) for v in (round(a + d * progress),)]
+            else:
+                self.style[key] = [round(a + d * progress) for a, d in zip(start, diff)]
 
         return self.style
 
@@ -416,11 +651,35 @@ class Transition:
 
 
 
+_sized_text_cache: LRUCache = LRUCache(256)
+
+
 def auto_sized_text(text: str, font: pygame.Font, font_params, border_rect: pygame.FRect):
-    if type(font_params) is tuple:
-        textSurface = font.render(text, *font_params).convert_alpha()
-    elif type(font_params) is dict:
+    """
+    Renders the text scaled to fit into `border_rect`. Returns the surface and its rect.
+    The results are cached, do not draw on the returned Surface.
+    If a font is changed in place (e.g. its `point_size`), call `auto_sized_text.cache_clear()`.
+    """
+    key = (font, text, freeze(font_params), border_rect.w, border_rect.h)
+    textSurface = _sized_text_cache.get(key)
+    if textSurface is not None:
+        return textSurface, textSurface.get_rect()
+
+    # Antialiased text in other opaque colors is the white text tinted, so changing the color (e.g. in a transition) does not render it again
+    if type(font_params) is tuple and len(font_params) == 2 and font_params[0]:
+        color = pygame.Color(font_params[1])
+        if color.a == 255 and color != (255,255,255,255):
+            white, _ = auto_sized_text(text, font, (font_params[0], (255,255,255)), border_rect)
+            textSurface = white.copy()
+            textSurface.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+            _sized_text_cache[key] = textSurface
+            return textSurface, textSurface.get_rect()
+
+    # the unscaled render is large (the basic font is 500pt), so it is not kept
+    if type(font_params) is dict:
         textSurface = font.render(text, **font_params).convert_alpha()
+    else:
+        textSurface = font.render(text, *font_params).convert_alpha()
 
     
     if border_rect.h > border_rect.w or textSurface.get_height() > textSurface.get_width():
@@ -430,9 +689,109 @@ def auto_sized_text(text: str, font: pygame.Font, font_params, border_rect: pyga
         textSurface = pygame.transform.smoothscale(
             textSurface, (border_rect.w, int(border_rect.w / textSurface.get_width() * textSurface.get_height())))
 
+    _sized_text_cache[key] = textSurface
 
     return textSurface, textSurface.get_rect()
 
+auto_sized_text.cache_clear = _sized_text_cache.clear
+
+
+
+
+
+
+_image_cache: dict[tuple[str, bool], pygame.Surface] = {}
+_scaled_cache: LRUCache = LRUCache(128)
+
+
+def load_image(path: str, alpha: bool = False, size: Coordinate | None = None) -> pygame.Surface:
+    """
+    Loads and converts an image, scaled to `size` if it is given. Every file is only loaded (and scaled to each size) once, later calls return the same Surface.
+
+    Do not draw on the returned Surface, copy it first.
+    """
+    if size is not None:
+        size = (int(size[0]), int(size[1]))
+        key = (path, bool(alpha), size)
+        scaled = _scaled_cache.get(key)
+        if scaled is None:
+            image = load_image(path, alpha)
+            scaled = image if image.get_size() == size else pygame.transform.scale(image, size)
+            _scaled_cache[key] = scaled
+        return scaled
+
+    key = (path, bool(alpha))
+    image = _image_cache.get(key)
+    if image is None:
+        if alpha:
+            image = pygame.image.load(path).convert_alpha()
+        else:
+            image = pygame.image.load(path).convert()
+        _image_cache[key] = image
+
+    return image
+
+
+
+
+
+
+_border_cache: LRUCache = LRUCache(128)
+
+# Images of the transition frames of `StatedSprite`s. A transition that runs again with the same steps (e.g. a hover effect) reuses them.
+_transition_cache: SurfaceCache = SurfaceCache(32 << 20)
+
+# Constructed progress bar images (`ui.ProgressBar`). Bars with the same size, style and filled width share their image.
+_bar_cache: LRUCache = LRUCache(128)
+
+
+def border_surface(size: Coordinate, color: ColorValue, width: int, radius: int | tuple[int,int,int,int] | None = None) -> pygame.Surface:
+    """
+    A transparent surface with only a border drawn on it. Sprites with the same size and border share the same surface.
+
+    Do not draw on the returned Surface, copy it first.
+    """
+    key = (tuple(size), freeze(color), width, freeze(radius))
+    surf = _border_cache.get(key)
+    if surf is None:
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(surf, color, surf.get_rect(), width=width, **radius_kwds(radius))
+        _border_cache[key] = surf
+
+    return surf
+
+
+
+def convert_surface(surf: pygame.Surface) -> pygame.Surface:
+    """
+    Converts the surface to the pixel format of the display with `.convert_alpha`, which makes blitting it faster.
+    Returns the surface unchanged if there is no display yet.
+    """
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha()
+
+
+
+
+
+
+def clear_caches():
+    """
+    Empties the shared caches of the library (fonts, loaded and scaled images, rendered text, borders, transition frames and progress bars), releasing the objects in them.
+    Fonts stay open as long as they are cached, so call this if you are done with them, e.g. before `pygame.quit()`.
+
+    Images saved by the sprites themselves (the states of a `Button`) are not cleared, they are released with the sprite.
+    """
+    _font_cache.clear()
+    _image_cache.clear()
+    _scaled_cache.clear()
+    _sized_text_cache.clear()
+    _border_cache.clear()
+    _radius_cache.clear()
+    _transition_cache.clear()
+    _bar_cache.clear()
+
 
 
 
@@ -443,8 +802,7 @@ def get_value(d: dict, *keys, default=None):
     Goes through the list of keys and if it finds a value, returns it
     """
     for key in keys:
-        val = d.get(key)
-        if val:
+        if (val := d.get(key)) is not None:
             return val
     
     return default
@@ -452,13 +810,28 @@ def get_value(d: dict, *keys, default=None):
 
 
 
+# radius keywords of the int and tuple radii in styles. Transitioned radii are lists, so they are not cached.
+_radius_cache: dict[tuple, dict | tuple] = {}
+
+
 def radius_kwds(val: int | tuple[int, int, int, int], only_tuple = False):
+    """The results of int and tuple radii are cached, do not change them."""
     if val is None:
         return {}
     if type(val) is dict:
         return val
-    
-    
+
+    if type(val) is int or type(val) is tuple:
+        key = (val, only_tuple)
+        kwds = _radius_cache.get(key)
+        if kwds is None:
+            kwds = _radius_cache[key] = _radius_kwds(val, only_tuple)
+        return kwds
+
+    return _radius_kwds(val, only_tuple)
+
+
+def _radius_kwds(val, only_tuple):
     if type(val) is int:
         val = (val,val,val,val)
 
@@ -466,9 +839,9 @@ def radius_kwds(val: int | tuple[int, int, int, int], only_tuple = False):
         return val
     
      
+    # -1 is pygame's own default for a corner radius, those corners use `border_radius`
     if len(val) < 4:
-        val = [*val]
-        val.extend([-1 for _ in range(4-len(val))])
+        val = (*val, -1, -1, -1, -1)
 
     return {'border_top_left_radius': val[0], 'border_top_right_radius': val[1],
                 'border_bottom_left_radius': val[2], 'border_bottom_right_radius': val[3]}
@@ -476,6 +849,20 @@ def radius_kwds(val: int | tuple[int, int, int, int], only_tuple = False):
 
 
 
+def is_rounded(radius: int | tuple | dict | None) -> bool:
+    """Whether a `border_radius` value rounds any of the corners."""
+    if not radius:
+        return False
+    if type(radius) is int:
+        return radius > 0
+    if type(radius) is dict:
+        radius = radius.values()
+
+    return any(r > 0 for r in radius)
+
+
+
+
 def to_rgba(color: ColorValue | None) -> tuple[int,int,int,int]:
     """
     Formats a color value to RGBA.
@@ -485,10 +872,16 @@ def to_rgba(color: ColorValue | None) -> tuple[int,int,int,int]:
     if color is None:
         return (0,0,0,0)
 
-    if type(color) not in (str, int):
-        if len(color) < 4:
-            color = [*color]
-            color.extend([255 for _ in range(4-len(color))])
+    t = type(color)
+    if t is tuple and len(color) == 4:
+        return color
+
+    if t is not str and t is not int:
+        n = len(color)
+        if n == 3:
+            return (color[0], color[1], color[2], 255)
+        if n < 3:
+            return (*color, 255, 255, 255)[:4]
     
     return tuple(color)
 
@@ -506,6 +899,3 @@ def check_rect_auto(rect, rect2 = None, check: bool = True) -> list[int, int, in
                     rect[i] = rect2[i]
         
         return rect
-    
-
-    
\ No newline at end of file
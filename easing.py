@@ -1,17 +1,21 @@
-import math
+from math import cos, sin, sqrt, pi
+from types import MappingProxyType
+
+
+_HALF_PI = pi / 2
 
 
 def linear(t):
     return t
 
 def SineIn(t):
-    return -math.cos(t * math.pi / 2) + 1
+    return 1 - cos(t * _HALF_PI)
 
 def SineOut(t):
-    return math.sin(t * math.pi / 2)
+    return sin(t * _HALF_PI)
 
 def SineInOut(t):
-    return -(math.cos(math.pi * t) - 1) / 2
+    return (1 - cos(pi * t)) / 2
 
 def QuadIn(t):
     return t * t
@@ -73,40 +77,40 @@ def QuintInOut(t):
         return (t * t * t * t * t + 2) / 2
 
 def ExpoIn(t):
-    return math.pow(2, 10 * (t - 1))
+    return 2 ** (10 * (t - 1))
 
 def ExpoOut(t):
-    return -math.pow(2, -10 * t) + 1
+    return 1 - 2 ** (-10 * t)
 
-# FIXME: too large walues
 def ExpoInOut(t):
     t *= 2
     if t < 1:
-        return math.pow(2, 10 * (t - 1)) / 2
+        return 2 ** (10 * (t - 1)) / 2
     else:
         t -= 1
-        return -math.pow(2, -10 * t) - 1
+        return (2 - 2 ** (-10 * t)) / 2
 
-# FIXME: math domain error
+# the circular functions are only defined between -1 and 1, values outside are clamped to the edge
 def CircIn(t):
-    return 1 - math.sqrt(1 - t * t)
+    return 1 - sqrt(max(0.0, 1 - t * t))
 
 def CircOut(t):
     t -= 1
-    return math.sqrt(1 - t * t)
+    return sqrt(max(0.0, 1 - t * t))
 
 def CircInOut(t):
     t *= 2
     if t < 1:
-        return -(math.sqrt(1 - t * t) - 1) / 2
+        return (1 - sqrt(max(0.0, 1 - t * t))) / 2
     else:
         t -= 2
-        return (math.sqrt(1 - t * t) + 1) / 2
+        return (sqrt(max(0.0, 1 - t * t)) + 1) / 2
     
 
 
 
-EASING_FUNCTIONS = {
+# read-only, custom easing functions can be passed to transitions directly
+EASING_FUNCTIONS = MappingProxyType({
     "linear": linear,
     "cubic_in": CubicIn,
     "cubic_out": CubicOut,
@@ -114,9 +118,6 @@ EASING_FUNCTIONS = {
     "quadric_in": QuadIn,
     "quadric_out": QuadOut,
     "quadric_in_out": QuadInOut,
-    "cubic_in": CubicIn,
-    "cubic_out": CubicOut,
-    "cubic_in_out": CubicInOut,
     "sine_in": SineIn,
     "sine_out": SineOut,
     "sine_in_out": SineInOut,
@@ -132,4 +133,4 @@ EASING_FUNCTIONS = {
     "quintic_in": QuintIn,
     "quintic_out": QuintOut,
     "quintic_in_out": QuintInOut,
-}
+})
@@ -1,4 +1,6 @@
 from .core import *
+from .core import _transition_cache
+
 
 class Sprite(pygame.sprite.Sprite):
     """
@@ -73,29 +75,7 @@ class Sprite(pygame.sprite.Sprite):
             Open `examples.py` in the base directory of the library.
         """
         def decorator(func):
-            nonlocal name
-            if name is None:
-                name = func.__name__
-
-            nonlocal check
-            if check is None:
-                check = DEFAULT_EVENT_CHECKS.get(name, lambda _,__: True)
-            elif type(check) is str:
-                check = DEFAULT_EVENT_CHECKS.get(check, lambda _,__: True)
-
-
-
-            def wrapper(sprite, event, *args, **kwargs):
-                if return_self:
-                    return func(sprite, check(sprite,event), *args, **kwargs)
-            
-                return func(check(sprite,event), *args, **kwargs)
-
-
-            self.Events[name] = wrapper
-                                
-
-            return wrapper
+            return self.add_event(func, check, name, return_self)
         return decorator
 
 
@@ -105,24 +85,26 @@ class Sprite(pygame.sprite.Sprite):
             name = func.__name__
         if check is None:
             check = DEFAULT_EVENT_CHECKS.get(name, lambda _,__: True)
-        if check is None:
-            check = DEFAULT_EVENT_CHECKS.get(name, lambda _,__: True)
         elif type(check) is str:
             check = DEFAULT_EVENT_CHECKS.get(check, lambda _,__: True)
 
-        
-        def wrapper(sprite, event, *args, **kwargs):
-            if return_self:
+
+        # picking the wrapper here saves checking `return_self` on every event
+        if return_self:
+            def wrapper(sprite, event, *args, **kwargs):
                 return func(sprite, check(sprite,event), *args, **kwargs)
-        
-            return func(check(sprite,event), *args, **kwargs)
+        else:
+            def wrapper(sprite, event, *args, **kwargs):
+                return func(check(sprite,event), *args, **kwargs)
 
         self.Events[name] = wrapper
+        return wrapper
 
 
 
     def handle_event(self, event: pygame.Event, *args, **kwds):
         """Call this when looping through events."""
+        MouseState.refresh()
         for spriteEvent in self.Events.values():
             spriteEvent(self, event, *args, **kwds)
 
@@ -141,14 +123,37 @@ class SpriteGroup(pygame.sprite.Group):
     Group of Sprites.
     """
     def __init__(self, *elements):
+        self._sprite_tuple: tuple | None = None # members for `handle_event`, rebuilt after adding or removing sprites
         super().__init__(*elements)
 
 
 
     def handle_event(self, event: pygame.Event):
         """Call this when looping through events."""
-        for sprite in self.sprites():
-            sprite.handle_event(event)
+        # the tuple is not changed by adding or removing sprites while handling the event
+        sprites = self._sprite_tuple
+        if sprites is None:
+            sprites = self._sprite_tuple = tuple(self.spritedict)
+
+        # the mouse is read once for all the sprites
+        MouseState.refresh()
+        held = MouseState.held
+        MouseState.held = True
+        try:
+            for sprite in sprites:
+                sprite.handle_event(event)
+        finally:
+            MouseState.held = held
+
+
+    def add_internal(self, sprite, layer=None):
+        self._sprite_tuple = None
+        super().add_internal(sprite, layer)
+
+
+    def remove_internal(self, sprite):
+        self._sprite_tuple = None
+        super().remove_internal(sprite)
     
 
     def update(self, delta_time: float, *args, **kwds):
@@ -195,6 +200,9 @@ class StatedSprite(Sprite):
     def __init__(self, rect: pygame.FRect = None, *groups, **style):
         super().__init__(None, rect, *groups)
 
+        # the image allocated by `_construct`, it can be drawn over as long as it is not stored anywhere else
+        self._own_image: pygame.Surface | None = None
+
         self.states: dict[str, Style] = {
             'default': style
         }
@@ -204,16 +212,17 @@ class StatedSprite(Sprite):
         self.construct('default')
 
         self._transition = None
-        self.style = self.states['default'].copy()
+        self.style = self.states['default']
     
 
 
     def change_style(self, state: str | Style | None, change_selected = True):
+        # `self.style` is not copied, it is never changed in place
         if type(state) is str:
             if not self.states.get(state):
                 raise KeyError(f'{state} is not a valid state. (not in {self.__class__}.states)')
             
-            self.style = self.states[state].copy()
+            self.style = self.states[state]
             if change_selected:
                 self.selected_state = state
 
@@ -223,7 +232,7 @@ class StatedSprite(Sprite):
                 self.selected_state = None
 
         else:
-            self.style = state.copy()
+            self.style = state
             if change_selected:
                 self.selected_state = None
 
@@ -240,47 +249,56 @@ class StatedSprite(Sprite):
             
             
 
+        bg = style.get('bg', (0,0,0,0))
+
         if reset_image:
-            self.image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            # a background without rounding overwrites every pixel, so the old image can be drawn over without clearing it
+            image = self._own_image
+            if (image is None or image is not self.image or not bg or is_rounded(style.get('border_radius'))
+                    or image.get_size() != (int(self.rect.w), int(self.rect.h))):
+                self.image = self._own_image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
         
         border_width = style.get('border_width', 2)
         border_radius = radius_kwds(style.get('border_radius'))
 
 
         # Background
-        bg = style.get('bg', (0,0,0,0))
         if bg:
             pygame.draw.rect(self.image, bg, self.nullrect, **border_radius)
 
 
         # Foreground
         fg = style.get('fg')
-        fg_rect = style.get('fg_rect', pygame.FRect(0,0,0,0))
-        fg_radius = radius_kwds(style.get('fg_radius'))
-
         if fg:
-            pygame.draw.rect(self.image, fg, fg_rect,**fg_radius)
+            fg_rect = style.get('fg_rect') or pygame.FRect(0,0,0,0)
+            fg_radius = radius_kwds(style.get('fg_radius'))
+
+            if fg_radius:
+                pygame.draw.rect(self.image, fg, fg_rect,**fg_radius)
+            else:
+                # without rounding a plain fill does the same, but faster
+                self.image.fill(fg, fg_rect)
         
         # Load image if the path is given
         image = style.get('image')
-        if type(image) is str:
-            if style.get('img_alpha'):
-                image = pygame.image.load(image).convert_alpha()
-            else:
-                image = pygame.image.load(image).convert()
-
+        if image:
+            # Scale the image
+            scale = style.get('img_scale')
+            if scale == 'auto':
+                scale = self.rect.size
 
-        # Scale the image
-        scale = style.get('img_scale')
-        if scale == 'auto':
-            image = pygame.transform.scale(image, self.rect.size)
+            # only images loaded from a file are cached, the caller can draw on their own Surface
+            if type(image) is str:
+                image = load_image(image, style.get('img_alpha', False), scale or None)
 
-        elif scale:
-            image = pygame.transform.scale(image, scale)
+            elif scale:
+                image = pygame.transform.scale(image, scale)
         
-        # Blit the image
+        # The image and the text are blitted together with one fblits call
+        blits = []
+
         if image:
-            self.image.blit(image,(0,0))
+            blits.append((image, (0,0)))
         
 
         # Handle text
@@ -300,10 +318,13 @@ class StatedSprite(Sprite):
             text_surf, text_rect = auto_sized_text(text, font, font_params, rect_without_border)
             
             # Automatic centering
-            pos = style.get('text_pos', (self.rect.w/2, self.rect.h/2))
-            text_rect.center = pos
+            pos = style.get('text_pos')
+            text_rect.center = pos if pos else (self.rect.w/2, self.rect.h/2)
 
-            self.image.blit(text_surf, text_rect)
+            blits.append((text_surf, text_rect))
+
+        if blits:
+            self.image.fblits(blits)
     
 
 
@@ -354,13 +375,19 @@ class StatedSprite(Sprite):
         # Border
         border = style.get('border')
         if border:
-            pygame.draw.rect(
-                self.image,
-                border,
-                self.nullrect,
-                width=border_width,
-                **border_radius
-            )
+            radius = style.get('border_radius')
+            if border_width > 0 and not is_rounded(radius):
+                # without rounding, four fills only touch the border pixels
+                w, h = self.image.get_size()
+                self.image.fill(border, (0, 0, w, border_width))
+                self.image.fill(border, (0, h-border_width, w, border_width))
+                self.image.fill(border, (0, 0, border_width, h))
+                self.image.fill(border, (w-border_width, 0, border_width, h))
+            elif pygame.Color(border).a == 255:
+                self.image.blit(border_surface(self.rect.size, border, border_width, radius), (0,0))
+            else:
+                # blitting would blend a translucent border over the background, drawing overwrites it like the fills do
+                pygame.draw.rect(self.image, border, self.nullrect, width=border_width, **border_radius)
 
 
     
@@ -426,11 +453,11 @@ class StatedSprite(Sprite):
         if rect:
             _state['rect'] = check_rect_auto(rect, self.rect, _state.get('check_rect_auto', True))
             _state['check_rect_auto'] = False
-            self.style['rect'] = [*self.rect]
+            self.style = {**self.style, 'rect': [*self.rect]}
 
 
         self._transition = None
-        self._transition = Transition(time, self.style, _state,style_keys, _all=_all, easing=easing)
+        self._transition = Transition(time, self.style, _state, *style_keys, _all=_all, easing=easing)
             
 
     
@@ -440,13 +467,37 @@ class StatedSprite(Sprite):
         super().update(delta_time)
 
         if self._transition:
-            if self._transition.finished: # remove if finished
+            if self._transition.finished: # remove if finished, its last frame was exactly the target style
                 self._transition = None
-                self._construct(**self.style) # Fix possibly not perfect ending of transition
             else:
-                self._transition.tick(delta_time)
-                self.change_style(self._transition.style, False)
-                self._construct(**self._transition.style)
+                style = self._transition.tick(delta_time)
+                if not self._transition.changed:
+                    return
+                self.change_style(style, False)
+
+                # only plain sprites with a fixed rect, their image depends on nothing but the style and the size
+                if type(self)._construct is StatedSprite._construct and 'rect' not in self._transition.style_keys:
+                    # colors are rounded to steps of 4, so a transition has a limited number of different frames. The last frame is exact.
+                    if not self._transition.finished:
+                        for k in COLOR_KEYS & self._transition.style_keys:
+                            style[k] = [min(255, (v + 2) & ~3) for v in style[k]]
+
+                    key = (tuple(self.rect.size), freeze(style))
+                    try:
+                        image = _transition_cache.get(key)
+                    except TypeError: # a style value that can't be a key, the frame is rendered without the cache
+                        self._construct(**style)
+                        return
+
+                    if image is None:
+                        self._construct(**style)
+                        self.image = convert_surface(self.image)
+                        _transition_cache[key] = self.image
+                        self._own_image = None # shared by the cache now
+                    else:
+                        self.image = image
+                else:
+                    self._construct(**style)
 
 
 
@@ -474,43 +525,68 @@ class GenericCombinedSprite(dict[T1, T2]):
 
     # TODO: optimize this so it doesn't run multiple times each frame
     def handle_event(self, event: pygame.Event):
+        # the sprites' rects are moved to screen position in place while they handle the event
+        dx, dy = self.rect.topleft
         for sprite in self.values():
-            rect = sprite.rect.copy()
-            sprite.rect = pygame.FRect(self.rect.left + sprite.rect.left,
-                               self.rect.top + sprite.rect.top,
-                               sprite.rect.width,
-                               sprite.rect.height)
-            sprite.handle_event(event)
-            sprite.rect = rect
+            rect = sprite.rect
+            pos = rect.topleft
+            rect.move_ip(dx, dy)
+            moved = rect.topleft
+            try:
+                sprite.handle_event(event)
+            finally:
+                # a handler that placed the sprite itself (e.g. constructing a state with a rect) keeps that position
+                if sprite.rect is rect and rect.topleft == moved:
+                    rect.topleft = pos
 
 
     def draw(self, surf: pygame.Surface):
-        image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        ox, oy = self.rect.topleft
+
+        # the sprites are clipped to the rect, as if they were drawn on a separate surface
+        clip = surf.get_clip()
+        surf.set_clip(clip.clip(self.rect))
+
+        # plain sprites are blitted together, combined sprites and sprites with their own `draw` draw themselves in between, moved to screen position
+        blits = []
         for sprite in self.values():
-            sprite.draw(image)
+            if isinstance(sprite, GenericCombinedSprite) or type(sprite).draw is not Sprite.draw:
+                if blits:
+                    surf.fblits(blits)
+                    blits = []
+                rect = sprite.rect
+                pos = rect.topleft
+                rect.move_ip(ox, oy)
+                try:
+                    sprite.draw(surf)
+                finally:
+                    rect.topleft = pos
+            else:
+                blits.append((sprite.image, (ox + sprite.rect.x, oy + sprite.rect.y)))
 
-        surf.blit(image, self.rect)
+        if blits:
+            surf.fblits(blits)
+        surf.set_clip(clip)
 
 
-    def __getattribute__(self, name: T1) -> Any:
+    # only called when normal attribute lookup fails, so real attributes don't pay for the item fallback
+    def __getattr__(self, name: T1) -> Any:
         try:
-            return super().__getattribute__(name)
-        except AttributeError:
-            try:
-                return self.__getitem__(name)
-            except KeyError:
-                raise AttributeError(f"No attribute or key named '{name}'.")
+            return dict.__getitem__(self, name)
+        except KeyError:
+            raise AttributeError(f"No attribute or key named '{name}'.") from None
         
 
     def __setattr__(self, name: T1, value: T2) -> None:
-        if self.get(name):
-            self.__setitem__(name, value)
+        if name in self:
+            # an existing item can't share its name with an attribute, see `__setitem__`
+            dict.__setitem__(self, name, value)
         else:
             super().__setattr__(name, value)
 
 
     def __setitem__(self, key: T1, value: T2) -> None:
-        if super().__getattribute__(key):
+        if key in self.__dict__ or hasattr(type(self), key):
             raise KeyError(f"'{key}' is already an attribute of this object! You cannot have items named the same as attributes.")
         super().__setitem__(key, value)
 
@@ -550,13 +626,13 @@ class GenericCombinedStatedSprite(GenericCombinedSprite[T1, T2]):
         #     }
         # }
         #
-        self.states: CombinedStyle = {
+        self.states: dict[str, CombinedStyle] = {
             'default': {key: 'default' for key in self.keys()},
         }
 
         self.selected_state = 'default'
 
-        self.style = self.states[self.selected_state].copy()
+        self.style = self.states[self.selected_state]
 
     
 
@@ -567,7 +643,7 @@ class GenericCombinedStatedSprite(GenericCombinedSprite[T1, T2]):
             
             self.selected_state = state
             if change_selected:
-                self.style = self.states[state].copy()
+                self.style = self.states[state]
 
         elif state is None:
             self.style = {}
@@ -575,7 +651,7 @@ class GenericCombinedStatedSprite(GenericCombinedSprite[T1, T2]):
                 self.selected_state = None
 
         else:
-            self.style = state.copy()
+            self.style = state
             if change_selected:
                 self.selected_state = None
 
@@ -596,15 +672,23 @@ class GenericCombinedStatedSprite(GenericCombinedSprite[T1, T2]):
             if not force and style == self.selected_state:
                 return
             
+            states = self.states.get(style)
+            if states is None:
+                raise KeyError(f'{style} is not a valid state. (not in {self.__class__}.states)')
+
             for key, sprite in self.items():
-                try:
-                    sprite.construct(self.states[style][key])
-                except:
-                    raise KeyError(f'{style} is not a valid state. (not in {sprite.__class__}.states)')
+                sprite.construct(states[key])
+
+            self.selected_state = style
+            self.style = states
         
-        elif type(style) is CombinedStyle:
+        elif isinstance(style, dict):
             for key, sprite in self.items():
-                sprite.construct(style[key])
+                if key in style:
+                    sprite.construct(style[key])
+
+            self.selected_state = None
+            self.style = style
             
         
 
@@ -631,10 +715,13 @@ class GenericCombinedStatedSprite(GenericCombinedSprite[T1, T2]):
                 raise KeyError(f'{state} is not a valid state. (not in {self.__class__}.states)')
             
 
-            self.change_style(state)
+            # `change_style` is not used, it would select the states of the sprites before they could transition into them
+            self.selected_state = state
+            self.style = self.states[state]
             
+            # each sprite transitions into its own state of the combined state
             for key, sprite in self.items():
-                sprite.transition(state[key], time, style_keys, _all=_all, easing=easing, force=force)
+                sprite.transition(self.style[key], time, *style_keys, _all=_all, easing=easing, force=force)
 
 
 
@@ -663,7 +750,7 @@ class AnimatedSprite(StatedSprite):
     ### 
     """
     def __init__(self, rect: pygame.FRect = None, *groups, **kwds):
-        super().__init__(None, rect, *groups, **kwds)
+        super().__init__(rect, *groups, **kwds)
 
 
         self.frozen = False
@@ -681,8 +768,9 @@ class AnimatedSprite(StatedSprite):
         
         if not self.frozen:
             anim = self.current_anim
-            anim.tick()
-            self.image = anim.frames[anim.frame]
+            if anim is not None:
+                anim.tick()
+                self.image = anim.frame # loads the frame if the animation is lazy
 
 
     
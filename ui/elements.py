@@ -2,9 +2,19 @@ from _collections_abc import dict_values
 import pygame
 from typing import Self
 from ..sprite import *
+from ..core import _bar_cache
 
 
 
+def bar_width(width: float, value: float, max_val: float) -> int:
+    """The width of the filled part of a progress bar, in whole pixels."""
+    if value <= 0 or max_val <= 0:
+        return 0
+    if value >= max_val:
+        return int(width)
+    return int(width * value / max_val)
+
+
 class Button(StatedSprite):
     def __init__(self,
                  rect: pygame.FRect = None,
@@ -29,11 +39,18 @@ class Button(StatedSprite):
             'text': text
             })
         
+        # rendered image of each state, see `construct`
+        self._state_images: dict[str, tuple[tuple, pygame.Surface]] = {}
+
         super().__init__(rect, **style)
 
 
         self.states['hover'] = _hover_state
 
+        # render the hover state now, so the first hover is only an image swap
+        self.construct('hover')
+        self.construct('default')
+
 
 
 
@@ -48,6 +65,28 @@ class Button(StatedSprite):
 
 
 
+    def construct(self, state: str = None, **style):
+        """
+        Same as `StatedSprite.construct`, but every state is only rendered once.
+        Later calls with the same state swap in the saved image, as long as the state and the size of the button did not change.
+        """
+        if type(state) is not str or self.states.get(state, {}).get('rect'):
+            return super().construct(state, **style)
+
+        key = (tuple(self.rect.size), freeze(self.states.get(state)))
+        saved = self._state_images.get(state)
+        if saved and saved[0] == key:
+            self.change_style(state)
+            self.image = saved[1]
+            return
+
+        super().construct(state)
+        self.image = convert_surface(self.image)
+        self._state_images[state] = (key, self.image)
+        self._own_image = None # shared by the saved states now
+
+
+
 
 
 
@@ -88,10 +127,12 @@ class ProgressBar(StatedSprite):
             }
         
 
-        self.max_val: float = style.get('max_value', 100)
-        self.value: float = style.get('value', 0)
+        # not style keys, keeping them out of the style lets equal looking bars share their image
+        self.max_val: float = style.pop('max_value', 100)
+        self.value: float = style.pop('value', 0)
 
         self._old_value = self.value
+        self._fg_w: int | None = None # filled width at the last construct
 
         super().__init__(rect, **style)
 
@@ -102,17 +143,39 @@ class ProgressBar(StatedSprite):
         if self.value != self._old_value:
             if self.value > self.max_val:
                 self.value = self.max_val
-            else:
+
+            # nothing to redraw if the filled part did not change by a whole pixel
+            if bar_width(self.rect.w, self.value, self.max_val) != self._fg_w:
                 self.construct('default')
 
             self._old_value = self.value
 
 
-    
+
     def _construct(self, **kwds):
-        
-        fg_w = self.rect.w * (self.value/self.max_val)
-        super()._construct(fg_rect=pygame.FRect(0, 0, fg_w, self.rect.h), **kwds)
+        # the value is bucketed to whole pixels, so values that look the same share an image
+        fg_w = bar_width(self.rect.w, self.value, self.max_val)
+        self._fg_w = fg_w
+
+        # a new rect has to be applied to the sprite, so it can't come from the cache
+        if kwds.get('rect'):
+            super()._construct(fg_rect=pygame.FRect(0, 0, fg_w, self.rect.h), **kwds)
+            return
+
+        key = (tuple(self.rect.size), fg_w, freeze(kwds))
+        try:
+            image = _bar_cache.get(key)
+        except TypeError: # a style value that can't be a key, the bar is rendered without the cache
+            super()._construct(fg_rect=pygame.FRect(0, 0, fg_w, self.rect.h), **kwds)
+            return
+
+        if image is None:
+            super()._construct(fg_rect=pygame.FRect(0, 0, fg_w, self.rect.h), **kwds)
+            self.image = convert_surface(self.image)
+            _bar_cache[key] = self.image
+            self._own_image = None # shared by the cache now
+        else:
+            self.image = image
 
 
 
@@ -133,7 +196,7 @@ class Switch(CombinedStatedSprite):
 
         if body is None:
             _brect = pygame.FRect(0,0,rect.w,rect.h)
-            body = Button(_brect,background=(100,100,100), border=(50,50,50), border_radius=1000)
+            body = Button(_brect,bg=(100,100,100), border=(50,50,50), border_radius=1000)
 
         if pointer is None:
             pointer = Button(pygame.FRect(0,0,rect.size[self._dim-1],rect.size[self._dim-1]), bg=(50,50,50), border=(0,0,0), border_radius=1000)
@@ -223,7 +286,7 @@ class Slider(CombinedSprite):
                 _brect = pygame.FRect(0,0,rect.w//2,rect.h)
                 _brect.centerx = rect.w//2
 
-            body = StatedSprite(_brect,background=(100,100,100), border=(50,50,50), border_radius=1000)
+            body = StatedSprite(_brect,bg=(100,100,100), border=(50,50,50), border_radius=1000)
 
 
         if pointer is None: